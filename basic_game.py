@@ -1,16 +1,188 @@
-import pygame
+# --- SOCX BASIC GAME --------- #
+# --- Shared game loop -------- #
 
-pygame.init()
+import math
+import os
+import time
+import pygame
 
 SCREEN_WIDTH = 400
 SCREEN_HEIGHT = 400
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+FPS = 60                   # frames drawn per second
+UPDATE_RATE = 60           # fixed game-logic updates per second
+MAX_UPDATES_PER_FRAME = 5  # don't spiral trying to catch up after a long frame
+
+# ---------------- Scene Class ----------------
+class Scene:
+    """
+    One screen of a game (a menu, the board, ...).
+    Subclasses override the hooks they need. To move to another scene set
+    self.next_scene; to end the game set self.done = True.
+    """
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    caption = "Socx"
+
+    def __init__(self):
+        self.next_scene = None
+        self.done = False
+
+    def enter(self, screen):
+        # Called when the scene becomes active
+        pass
+
+    def leave(self):
+        # Called when the scene is replaced or the loop stops
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        # dt is the fixed timestep in milliseconds
+        pass
+
+    def render(self, screen):
+        pass
+
+# ---------------- GameLoop Class ----------------
+class GameLoop:
+    """
+    Fixed-timestep loop: game logic advances in steps of 1000 / update_rate ms,
+    rendering happens once per frame at (at most) fps frames per second.
+    """
+    def __init__(self, fps=FPS, update_rate=UPDATE_RATE):
+        pygame.init()
+        self.fps = fps
+        self.dt = 1000 / update_rate
+        self.clock = pygame.time.Clock()
+        self.screen = None
+        self.scene = None
+        self.running = False
+        self._accumulator = 0.0
+
+    def set_scene(self, scene):
+        if self.scene is not None:
+            self.scene.leave()
+        self.scene = scene
+        if self.screen is None or self.screen.get_size() != tuple(scene.size):
+            self.screen = pygame.display.set_mode(scene.size)
+        pygame.display.set_caption(scene.caption)
+        scene.enter(self.screen)
+
+    def stop(self):
+        # The scene is dropped so leave() runs exactly once, even if the loop is reused
+        self.running = False
+        if self.scene is not None:
+            self.scene.leave()
+            self.scene = None
+
+    def frame(self, events, elapsed):
+        """
+        Run one frame: handle events, advance the game logic by elapsed ms
+        in fixed steps, then render.
+        """
+        self.process(events, elapsed)
+        if self.running:
+            self.draw()
+
+    def process(self, events, elapsed):
+        # Handle events and run the fixed-step updates for elapsed ms
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.stop()
+                return
+            self.scene.handle_event(event)
+
+        self._accumulator += elapsed
+        updates = 0
+        while self._accumulator >= self.dt and updates < MAX_UPDATES_PER_FRAME:
+            self.scene.update(self.dt)
+            self._accumulator -= self.dt
+            updates += 1
+        if updates == MAX_UPDATES_PER_FRAME:
+            # Too far behind: drop the time we can't catch up on
+            self._accumulator = 0.0
+
+    def draw(self):
+        # Render the current scene, then switch scenes if it asked to
+        self.scene.render(self.screen)
+        pygame.display.flip()
+
+        if self.scene.done:
+            self.stop()
+        elif self.scene.next_scene is not None:
+            self.set_scene(self.scene.next_scene)
+
+    def run(self, scene):
+        self.set_scene(scene)
+        self.running = True
+        while self.running:
+            elapsed = self.clock.tick(self.fps)
+            self.frame(pygame.event.get(), elapsed)
+
+# ---------------- Headless Driver ----------------
+def use_headless():
+    """
+    Use SDL's dummy drivers so the games run without a window.
+    Must be called before pygame is initialised (i.e. before importing a game).
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+class HeadlessDriver:
+    """
+    Drives a GameLoop from a script instead of the keyboard and mouse.
+    Each frame advances the game by a fixed 1000 / fps ms (so runs are repeatable).
+    The real time spent on each frame is recorded separately for the update part
+    (events and game logic, e.g. AI searches) and the render part.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+
+    def run(self, scene, script, frames):
+        """
+        script is a list of (frame_number, pygame.event.Event) pairs.
+        Returns {"update": [...], "render": [...]}, the times in milliseconds per frame.
+        """
+        events_by_frame = {}
+        for frame_number, event in script:
+            events_by_frame.setdefault(frame_number, []).append(event)
+
+        frame_times = {"update": [], "render": []}
+        self.loop.set_scene(scene)
+        self.loop.running = True
+        for frame_number in range(frames):
+            if not self.loop.running:
+                break
+            start = time.perf_counter()
+            self.loop.process(events_by_frame.get(frame_number, []), 1000 / self.loop.fps)
+            if not self.loop.running:
+                break
+            middle = time.perf_counter()
+            self.loop.draw()
+            end = time.perf_counter()
+            frame_times["update"].append((middle - start) * 1000)
+            frame_times["render"].append((end - middle) * 1000)
+        if self.loop.running:
+            self.loop.stop()
+        return frame_times
+
+def percentile(values, pct):
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+# ---------------- Example ----------------
+class BlankScene(Scene):
+    caption = "Basic Game"
 
-run = True
-while run:
-  for event in pygame.event.get():
-    if event.type == pygame.QUIT:
-      run = False
+    def render(self, screen):
+        screen.fill((0, 0, 0))
 
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    GameLoop().run(BlankScene())
+    pygame.quit()
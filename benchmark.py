@@ -0,0 +1,121 @@
+# --- SOCX BENCHMARKS --------- #
+# Replays scripted input through each game without a window
+# and reports frame time percentiles, for rendering and for updates
+# (events and game logic such as AI searches) separately.
+#
+#   python benchmark.py                  # print the report
+#   python benchmark.py --budget-ms 16   # also fail (exit 1) if any game's render p99 is over budget
+
+import argparse
+import os
+import sys
+
+import basic_game
+basic_game.use_headless()  # must happen before the games initialise pygame
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "chess"))
+sys.path.insert(0, os.path.join(ROOT, "checkers"))
+
+import pygame
+import chess
+import checkers
+import chess_game
+
+from basic_game import GameLoop, HeadlessDriver, percentile
+
+PERCENTILES = (50, 90, 99)
+
+# ---------------- Scripted Input ----------------
+def click(frame, pos):
+    return (frame, pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+def key(frame, key_code):
+    return (frame, pygame.event.Event(pygame.KEYDOWN, key=key_code))
+
+def drag(frame, start, end, steps=10):
+    # Press at start, move towards end over `steps` frames, release at end
+    events = [(frame, pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=start, button=1))]
+    for i in range(1, steps + 1):
+        x = start[0] + (end[0] - start[0]) * i // steps
+        y = start[1] + (end[1] - start[1]) * i // steps
+        events.append((frame + i, pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0), buttons=(1, 0, 0))))
+    events.append((frame + steps + 1, pygame.event.Event(pygame.MOUSEBUTTONUP, pos=end, button=1)))
+    return events
+
+def checkers_square(row, col):
+    return (col * checkers.SQUARE_SIZE + checkers.SQUARE_SIZE // 2,
+            row * checkers.SQUARE_SIZE + checkers.SQUARE_SIZE // 2)
+
+def chess_square(name):
+    return chess_game.get_square_rect(chess.parse_square(name), chess_game.SQUARE_SIZE).center
+
+def checkers_script(mode):
+    # Pick a mode from the menu, then play RED moves. Each move leaves enough
+    # frames for the AI's delay and reply; moves made illegal by the AI are ignored.
+    script = [key(0, pygame.K_1 if mode == "AI" else pygame.K_2)]
+    red_moves = [((5, 2), (4, 3)), ((5, 6), (4, 7)), ((6, 1), (5, 2)), ((5, 4), (4, 5)), ((6, 7), (5, 6))]
+    white_moves = [((2, 1), (3, 2)), ((2, 5), (3, 4)), ((1, 0), (2, 1)), ((2, 7), (3, 6)), ((1, 6), (2, 7))]
+    frame = 10
+    for i, (src, dest) in enumerate(red_moves):
+        script.append(click(frame, checkers_square(*src)))
+        script.append(click(frame + 5, checkers_square(*dest)))
+        frame += 60
+        if mode == "2P":
+            src, dest = white_moves[i]
+            script.append(click(frame, checkers_square(*src)))
+            script.append(click(frame + 5, checkers_square(*dest)))
+            frame += 20
+    return script, frame + 60
+
+def chess_script():
+    moves = ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "d2d3", "f8c5", "e1g1", "e8g8"]
+    script = []
+    frame = 0
+    for move in moves:
+        script.extend(drag(frame, chess_square(move[:2]), chess_square(move[2:])))
+        frame += 20
+    return script, frame + 20
+
+def benchmarks():
+    return [
+        ("checkers (2 players)", lambda: checkers.MenuScene(ponder=False), lambda: checkers_script("2P")),
+        ("checkers (vs AI)", lambda: checkers.MenuScene(ponder=False), lambda: checkers_script("AI")),
+        # Single-player as it really runs: the ponder slices show up in the update times
+        ("checkers (vs AI, pondering)", lambda: checkers.MenuScene(ponder=True), lambda: checkers_script("AI")),
+        ("chess (drag and drop)", chess_game.ChessScene, chess_script),
+    ]
+
+# ---------------- Main ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame time benchmarks for the Socx games.")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if any benchmark's p99 render time exceeds this many milliseconds")
+    args = parser.parse_args()
+
+    loop = GameLoop()
+    driver = HeadlessDriver(loop)
+    over_budget = []
+    header = f"{'benchmark':<30}{'part':<8}{'frames':>8}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, make_scene, make_script in benchmarks():
+        script, frames = make_script()
+        frame_times = driver.run(make_scene(), script, frames)
+        for part in ("render", "update"):
+            times = frame_times[part]
+            row = f"{name:<30}{part:<8}{len(times):>8}"
+            row += "".join(f"{percentile(times, p):>8.2f}ms" for p in PERCENTILES)
+            row += f"{max(times):>8.2f}ms"
+            print(row)
+        # Only rendering counts against the budget; updates include the AI's search
+        if args.budget_ms is not None and percentile(frame_times["render"], 99) > args.budget_ms:
+            over_budget.append(name)
+
+    pygame.quit()
+    if over_budget:
+        print(f"Over budget ({args.budget_ms}ms render p99): {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
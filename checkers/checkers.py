@@ -1,10 +1,16 @@
 # --- SOCX CHECKERS ----------- #
 # --- By Musterion for Socx --- #
-# --- Version 2.2.0 ----------- #
-# --- 08 Feb 2025 --------------#
+# --- Version 2.4.0 ----------- #
+# --- 19 Oct 2026 --------------#
 
-import pygame
+import os
 import sys
+import threading
+import time
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from basic_game import Scene, GameLoop
 
 # ---------------- Pygame Initialization and Global Constants ----------------
 pygame.init()
@@ -25,6 +31,20 @@ BLACK  = (0, 0, 0)
 GREY   = (128, 128, 128)
 BLUE   = (0, 0, 255)
 
+# AI search settings
+AI_DEPTH = 3
+# Pause (ms) before the AI moves, so its move is visible
+AI_DELAY = 500
+# Shorter pause when pondering already found the answer
+PONDER_HIT_DELAY = 100
+# Time (ms) the ponder search runs per update step while the human is thinking.
+# The search pauses at the first node after that, so a step can run a little over.
+PONDER_SLICE = 4
+# Transposition table is cleared once it grows past this many positions (~40 MB)
+TT_MAX_ENTRIES = 100000
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
 # ---------------- Piece Class ----------------
 class Piece:
     PADDING = 15
@@ -120,8 +140,12 @@ class Board:
             if piece != 0:
                 if piece.color == RED:
                     self.red_left -= 1
+                    if piece.king:
+                        self.red_kings -= 1
                 else:
                     self.white_left -= 1
+                    if piece.king:
+                        self.white_kings -= 1
 
     def winner(self):
         if self.red_left <= 0:
@@ -217,6 +241,14 @@ class Board:
                     pieces.append(piece)
         return pieces
 
+    def key(self):
+        # Compact snapshot of the position (used by the transposition table):
+        # one byte per square, 0 = empty, 1/2 = RED man/king, 3/4 = WHITE man/king
+        return bytes(
+            0 if piece == 0 else (1 if piece.color == RED else 3) + piece.king
+            for row in self.board for piece in row
+        )
+
     def clone(self):
         # Create a deep copy of the board (for simulation purposes)
         new_board = Board.__new__(Board)
@@ -239,9 +271,11 @@ class Board:
 
 # ---------------- Game Class ----------------
 class Game:
-    def __init__(self, win, mode):
+    def __init__(self, win, mode, ponder=True):
         self.win = win
         self.mode = mode  # "2P" or "AI"
+        # In AI mode the computer ponders (searches ahead) during the human's turn
+        self.ponderer = Ponderer() if mode == "AI" and ponder else None
         self._init()
 
     def _init(self):
@@ -250,6 +284,8 @@ class Game:
         # RED always starts; in AI mode human is RED, computer is WHITE.
         self.turn = RED
         self.valid_moves = {}
+        if self.ponderer is not None:
+            self.ponderer.start(self.board)
 
     def update(self, elapsed_time):
         # Draw the board (top portion)
@@ -266,9 +302,11 @@ class Game:
             win_x = WIDTH // 2 - winner_surface.get_width() // 2
             win_y = HEIGHT // 2 - winner_surface.get_height() // 2
             self.win.blit(winner_surface, (win_x, win_y))
-        pygame.display.update()
 
     def reset(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+            self.ponderer.tt.clear()
         self._init()
 
     def select(self, row, col):
@@ -357,6 +395,12 @@ class Game:
         self.valid_moves = {}
         self.selected = None
         self.turn = WHITE if self.turn == RED else RED
+        if self.ponderer is not None:
+            # Ponder while the human (RED) is thinking; stop as soon as it's the AI's turn.
+            if self.turn == RED:
+                self.ponderer.start(self.board)
+            else:
+                self.ponderer.stop()
 
 # ---------------- AI Helper Functions ----------------
 def evaluate(board):
@@ -381,54 +425,234 @@ def get_all_moves(board, color, game):
             moves.append((piece.row, piece.col, move, skip, new_board))
     return moves
 
-def minimax(board, depth, max_player, game, alpha, beta):
+class SearchAborted(Exception):
+    # Raised inside minimax when a ponder search is told to stop
+    pass
+
+def same_move(a, b):
+    # Compare two moves by origin and destination (moves from the table only have these)
+    return a is not None and b is not None and a[:3] == b[:3]
+
+def get_turn_results(board, color):
+    """
+    Every position color can end its turn in, as (first move, resulting board) pairs.
+    Like get_all_moves, but a capture is followed by further captures with the same
+    piece the way Game._move does it (the turn continues while that piece can capture).
+    """
+    results = {}
+    for move in get_all_moves(board, color, None):
+        for final in follow_captures(move[4], move[2], move[3]):
+            results.setdefault(final.key(), (move, final))
+    return list(results.values())
+
+def follow_captures(board, pos, skip):
+    # Positions reached by continuing a capture chain from pos (just board if there's none)
+    if not skip:
+        return [board]
+    captures = {move: s for move, s in board.get_valid_moves(board.get_piece(*pos)).items() if s}
+    if not captures:
+        return [board]
+    finals = []
+    for dest, s in captures.items():
+        temp_board = board.clone()
+        temp_piece = temp_board.get_piece(*pos)
+        finals.extend(follow_captures(simulate_move(temp_piece, dest, temp_board, s), dest, s))
+    return finals
+
+def minimax(board, depth, max_player, game, alpha, beta, tt=None, ponder=None):
+    if ponder is not None:
+        ponder.checkpoint()
     if depth == 0 or board.winner() is not None:
         return evaluate(board), board
 
+    # Transposition table lookup: reuse results from earlier (or pondered) searches
+    key = None
+    tt_move = None
+    alpha_orig, beta_orig = alpha, beta
+    if tt is not None:
+        key = (board.key(), max_player)
+        entry = tt.get(key)
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value, tt_move
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value, tt_move
+
+    moves = get_all_moves(board, WHITE if max_player else RED, game)
+    # Search the best move from the table first so the pruning kicks in early
+    if tt_move is not None:
+        moves.sort(key=lambda move: not same_move(move, tt_move))
+
     if max_player:
         max_eval = float('-inf')
         best_move = None
-        for move in get_all_moves(board, WHITE, game):
-            evaluation = minimax(move[4], depth - 1, False, game, alpha, beta)[0]
+        for move in moves:
+            evaluation = minimax(move[4], depth - 1, False, game, alpha, beta, tt, ponder)[0]
             if evaluation > max_eval:
                 max_eval = evaluation
                 best_move = move
             alpha = max(alpha, evaluation)
             if beta <= alpha:
                 break
-        return max_eval, best_move
+        best_eval = max_eval
     else:
         min_eval = float('inf')
         best_move = None
-        for move in get_all_moves(board, RED, game):
-            evaluation = minimax(move[4], depth - 1, True, game, alpha, beta)[0]
+        for move in moves:
+            evaluation = minimax(move[4], depth - 1, True, game, alpha, beta, tt, ponder)[0]
             if evaluation < min_eval:
                 min_eval = evaluation
                 best_move = move
             beta = min(beta, evaluation)
             if beta <= alpha:
                 break
-        return min_eval, best_move
+        best_eval = min_eval
+
+    if tt is not None and best_move is not None:
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        # Depth-preferred replacement: a shallower search must not overwrite a deeper
+        # (e.g. pondered) result. Only the move's origin and destination are kept.
+        existing = tt.get(key)
+        if existing is None or depth >= existing[0]:
+            tt[key] = (depth, flag, best_eval, best_move[:3])
+    return best_eval, best_move
+
+# ---------------- Pondering ----------------
+class Ponderer:
+    """
+    Searches while the human (RED) is thinking.
+    For each position the human's turn can end in (multi-jumps included, the
+    predicted reply first) it runs the same search the AI would run from there,
+    storing the results in a transposition table shared with ai_move. On a ponder
+    hit the AI's search is answered straight from the table; otherwise it still
+    starts from a warm table.
+    The search runs in a background thread, but only during the slices handed to
+    it by think(), so it never competes with drawing the screen.
+    """
+    def __init__(self, depth=AI_DEPTH):
+        self.depth = depth
+        self.tt = {}
+        # Guards the flags below, which hand control between think() and the search thread
+        self._cond = threading.Condition()
+        self._running = False    # inside a slice handed out by think()
+        self._deadline = 0.0     # end of the current slice (time.perf_counter())
+        self._searching = False  # search thread hasn't finished yet
+        self._stopped = False
+        self._thread = None
+
+    def start(self, board):
+        self.stop()
+        if len(self.tt) > TT_MAX_ENTRIES:
+            self.tt.clear()
+        with self._cond:
+            self._running = self._stopped = False
+            self._searching = True
+        self._thread = threading.Thread(target=self._ponder, args=(board.clone(),), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # Interrupt the background search and wait for it to finish
+        if self._thread is not None:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+
+    def think(self, ms):
+        # Let the search run for ms milliseconds; returns once it has paused at the next node
+        with self._cond:
+            if not self._searching:
+                return
+            self._deadline = time.perf_counter() + ms / 1000
+            self._running = True
+            self._cond.notify_all()
+            while self._searching and self._running:
+                self._cond.wait()
+
+    def checkpoint(self):
+        # Called by minimax at every node: pause once the slice is used up, bail out when stopped
+        with self._cond:
+            if self._running and time.perf_counter() >= self._deadline:
+                self._running = False
+                self._cond.notify_all()
+            while not self._running and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                raise SearchAborted()
+
+    def is_hit(self, board):
+        # True if the position (AI to move) has already been searched to full depth
+        entry = self.tt.get((board.key(), True))
+        return entry is not None and entry[0] >= self.depth and entry[1] == EXACT
+
+    def _ponder(self, board):
+        try:
+            self.checkpoint()
+            if board.winner() is not None:
+                return
+            replies = get_turn_results(board, RED)
+            # The reply the AI expected from its last search goes first,
+            # then the rest, best-looking for RED first.
+            entry = self.tt.get((board.key(), False))
+            predicted = entry[3] if entry is not None else None
+            replies.sort(key=lambda reply: (not same_move(reply[0], predicted), evaluate(reply[1])))
+            for _, final in replies:
+                minimax(final, self.depth, True, None, float('-inf'), float('inf'), self.tt, self)
+        except SearchAborted:
+            pass
+        finally:
+            # Nothing left to search: don't keep think() waiting
+            with self._cond:
+                self._searching = False
+                self._cond.notify_all()
 
 def ai_move(game):
     # Use minimax to decide the best move for WHITE (computer)
-    _, move = minimax(game.board.clone(), 3, True, game, float('-inf'), float('inf'))
+    tt = None
+    if game.ponderer is not None:
+        game.ponderer.stop()
+        tt = game.ponderer.tt
+    _, move = minimax(game.board.clone(), AI_DEPTH, True, game, float('-inf'), float('inf'), tt)
     if move is not None:
-        r, c, dest, skip, _ = move
+        # Moves from the table only carry origin and destination, so look up the captures again
+        r, c, dest = move[:3]
         piece = game.board.get_piece(r, c)
-        if piece is not None:
+        if piece != 0:
+            skip = game.board.get_valid_moves(piece)[dest]
             game.board.move(piece, dest[0], dest[1])
             if skip:
                 game.board.remove(skip)
         game.change_turn()
 
-# ---------------- Simple Menu ----------------
-def menu():
-    win = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Checkers Menu")
-    running = True
-    mode = None
-    while running:
+# ---------------- Menu Scene ----------------
+class MenuScene(Scene):
+    size = (WIDTH, HEIGHT)
+    caption = "Checkers Menu"
+
+    def __init__(self, ponder=True):
+        super().__init__()
+        self.ponder = ponder  # passed on to the game (benchmarks turn it off)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_1:
+                self.next_scene = GameScene("AI", self.ponder)
+            elif event.key == pygame.K_2:
+                self.next_scene = GameScene("2P", self.ponder)
+
+    def render(self, win):
         win.fill(BLACK)
         title_font = pygame.font.SysFont("comicsans", 60)
         option_font = pygame.font.SysFont("comicsans", 40)
@@ -438,58 +662,64 @@ def menu():
         option2 = option_font.render("Press 2 for Two Player Mode", True, WHITE)
         win.blit(option1, (WIDTH // 2 - option1.get_width() // 2, 300))
         win.blit(option2, (WIDTH // 2 - option2.get_width() // 2, 400))
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1:
-                    mode = "AI"
-                    running = False
-                elif event.key == pygame.K_2:
-                    mode = "2P"
-                    running = False
-    return mode
-
-# ---------------- Main Game Loop ----------------
-def main():
-    mode = menu()  # Show menu and let the user select a mode
-    win = pygame.display.set_mode((WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Checkers")
-    game = Game(win, mode)
-    clock = pygame.time.Clock()
-    start_time = pygame.time.get_ticks()  # Record start time for timer
-
-    running = True
-    while running:
-        clock.tick(60)  # 60 FPS
-        elapsed_time = pygame.time.get_ticks() - start_time
 
+# ---------------- Game Scene ----------------
+class GameScene(Scene):
+    size = (WIDTH, WINDOW_HEIGHT)
+    caption = "Checkers"
+
+    def __init__(self, mode, ponder=True):
+        super().__init__()
+        self.mode = mode
+        self.ponder = ponder
+        self.game = None
+        self.elapsed_time = 0  # game time in ms, for the timer
+        self.ai_wait = 0
+
+    def enter(self, win):
+        self.game = Game(win, self.mode, self.ponder)
+
+    def leave(self):
+        if self.game.ponderer is not None:
+            self.game.ponderer.stop()
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if game.mode == "2P" or (game.mode == "AI" and game.turn == RED):
+                pos = event.pos
+                # Only consider clicks on the board area (ignore clicks in info panel)
+                if pos[1] < HEIGHT:
+                    row = pos[1] // SQUARE_SIZE
+                    col = pos[0] // SQUARE_SIZE
+                    game.select(row, col)
+
+    def update(self, dt):
+        game = self.game
         # Do not exit when a winner is determined; simply display the winner on-screen.
+        if game.board.winner() is not None:
+            return
+        self.elapsed_time += dt
         # In single-player mode, let the AI move when it's WHITE's turn.
-        if game.mode == "AI" and game.turn == WHITE and game.board.winner() is None:
-            pygame.time.delay(500)  # Small delay to make the AI move visible
-            ai_move(game)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if game.mode == "2P" or (game.mode == "AI" and game.turn == RED):
-                    pos = pygame.mouse.get_pos()
-                    # Only consider clicks on the board area (ignore clicks in info panel)
-                    if pos[1] < HEIGHT:
-                        row = pos[1] // SQUARE_SIZE
-                        col = pos[0] // SQUARE_SIZE
-                        game.select(row, col)
-
-        if game.board.winner() is None:
-            game.update(elapsed_time)
-
+        if game.mode == "AI" and game.turn == WHITE:
+            self.ai_wait += dt
+            # On a ponder hit the answer is ready, so don't make the human wait for it
+            delay = AI_DELAY
+            if game.ponderer is not None and game.ponderer.is_hit(game.board):
+                delay = PONDER_HIT_DELAY
+            if self.ai_wait >= delay:
+                self.ai_wait = 0
+                ai_move(game)
+        elif game.ponderer is not None:
+            game.ponderer.think(PONDER_SLICE)
+
+    def render(self, win):
+        self.game.update(int(self.elapsed_time))
+
+# ---------------- Main ----------------
+def main():
+    # Show the menu first; it hands over to the game once a mode is chosen
+    GameLoop().run(MenuScene())
     pygame.quit()
 
 if __name__ == "__main__":
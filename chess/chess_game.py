@@ -1,49 +1,40 @@
 # --- SOCX CHESS -------------- #
 # --- By Musterion for Socx --- #
-# --- Version 1.3.0 ----------- #
-# --- 11 Feb 2025 --------------#
+# --- Version 1.5.0 ----------- #
+# --- 19 Oct 2026 --------------#
 
+import os
 import sys
 import pygame
 import chess
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from basic_game import Scene, GameLoop
+
 # --- Initialization ---
 
 pygame.init()
 WIDTH, HEIGHT = 700, 700  # window dimensions (square board)
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Socx Chess (WIP)")
-CLOCK = pygame.time.Clock()
 
 # Each square will be WIDTH//8 pixels wide/high.
 SQUARE_SIZE = WIDTH // 8
 
-# Create a chess board (using python-chess)
-board = chess.Board()
-
-# Instead of a selected square, we now keep track of a piece being dragged.
-# dragging_info is a dictionary containing:
-#   - "from_square": the square index where the piece was picked up.
-#   - "piece": the chess.Piece object being dragged.
-#   - "offset": the (x,y) offset from the top-left of the square where the mouse was clicked.
-#   - "current_pos": the current mouse position (updated during dragging).
-dragging_info = None
-
 # --- Load piece images ---
-# Images are stored in the "images" folder.
+# Images are stored in the "images" folder next to this file.
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
 piece_images = {}
-piece_images["K"] = pygame.image.load("images/w_king.png")
-piece_images["Q"] = pygame.image.load("images/w_queen.png")
-piece_images["R"] = pygame.image.load("images/w_rook.png")
-piece_images["B"] = pygame.image.load("images/w_bishop.png")
-piece_images["N"] = pygame.image.load("images/w_knight.png")
-piece_images["P"] = pygame.image.load("images/w_pawn.png")
-piece_images["k"] = pygame.image.load("images/b_king.png")
-piece_images["q"] = pygame.image.load("images/b_queen.png")
-piece_images["r"] = pygame.image.load("images/b_rook.png")
-piece_images["b"] = pygame.image.load("images/b_bishop.png")
-piece_images["n"] = pygame.image.load("images/b_knight.png")
-piece_images["p"] = pygame.image.load("images/b_pawn.png")
+piece_images["K"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_king.png"))
+piece_images["Q"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_queen.png"))
+piece_images["R"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_rook.png"))
+piece_images["B"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_bishop.png"))
+piece_images["N"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_knight.png"))
+piece_images["P"] = pygame.image.load(os.path.join(IMAGE_DIR, "w_pawn.png"))
+piece_images["k"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_king.png"))
+piece_images["q"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_queen.png"))
+piece_images["r"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_rook.png"))
+piece_images["b"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_bishop.png"))
+piece_images["n"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_knight.png"))
+piece_images["p"] = pygame.image.load(os.path.join(IMAGE_DIR, "b_pawn.png"))
 
 # Scale images to fit the square size.
 for key in piece_images:
@@ -56,6 +47,74 @@ HIGHLIGHT_COLOR = (50, 50, 200)  # can be used to highlight a square (if desired
 GAME_OVER_COLOR = (200, 0, 0)      # color for game over message
 HINT_COLOR = (255, 255, 0)         # yellow color for legal move hints
 
+# Colors for the analysis overlay (RGBA, drawn over the board squares)
+ATTACKED_COLOR = (200, 40, 40, 70)   # squares attacked by the opponent of the side to move
+HANGING_COLOR = (255, 140, 0, 255)   # outline around attacked pieces that nobody defends
+CHECK_COLOR = (255, 0, 0, 160)       # king in check
+ANALYSIS_CACHE_SIZE = 256            # positions kept in the analysis cache (bitboards only)
+
+# Surfaces that never change (the empty board, highlight tiles), built on first use.
+surface_cache = {}
+
+# --- Analysis Board ---
+
+class AnalysisBoard(chess.Board):
+    """
+    A chess.Board that also knows the attack maps of the current position:
+    a bitboard of attacked squares per side, the hanging pieces and the king in check.
+    These are only worked out again when the position changes, and are cached by
+    position. A single board surface with them drawn on it is kept for the current
+    position, so drawing them is one blit per frame.
+    """
+    def __init__(self, *args, **kwargs):
+        self._analysis = None
+        self._analysis_key = None
+        self._analysis_cache = {}
+        self._board_surface = None
+        self._surface_key = None
+        super().__init__(*args, **kwargs)
+
+    def position_key(self):
+        # Cheap key for what the analysis depends on: the piece bitboards and the side to move.
+        # Checked on every call, so any way of changing the board (push, pop, set_fen, ...) is noticed.
+        return (self.occupied_co[chess.WHITE], self.occupied_co[chess.BLACK],
+                self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings,
+                self.turn)
+
+    def analysis(self):
+        """
+        Return the analysis of the current position as a dictionary with:
+          - "attacks": {chess.WHITE: bitboard, chess.BLACK: bitboard} of attacked squares.
+          - "hanging": bitboard of pieces (either side) attacked and not defended.
+          - "check": the square of the king in check, or None.
+        """
+        key = self.position_key()
+        if key != self._analysis_key:
+            if key not in self._analysis_cache:
+                if len(self._analysis_cache) >= ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.clear()
+                self._analysis_cache[key] = compute_analysis(self)
+            self._analysis = self._analysis_cache[key]
+            self._analysis_key = key
+        return self._analysis
+
+    def analysis_surface(self, square_size):
+        """
+        Return the board squares with the analysis of the current position drawn on them.
+        Only redrawn when the position changes (an opaque surface is much cheaper
+        to blit every frame than a transparent overlay).
+        """
+        key = (self.position_key(), square_size)
+        if key != self._surface_key:
+            background = get_board_background(square_size)
+            if self._board_surface is None or self._board_surface.get_size() != background.get_size():
+                self._board_surface = background.copy()
+            else:
+                self._board_surface.blit(background, (0, 0))
+            draw_analysis(self._board_surface, self, self.analysis(), square_size)
+            self._surface_key = key
+        return self._board_surface
+
 # --- Helper Functions ---
 
 def get_square_rect(square, square_size):
@@ -70,6 +129,67 @@ def get_square_rect(square, square_size):
     y = row * square_size
     return pygame.Rect(x, y, square_size, square_size)
 
+def compute_attack_maps(board):
+    """
+    Return {chess.WHITE: bitboard, chess.BLACK: bitboard} of the squares each side attacks.
+    """
+    attacks = {chess.WHITE: 0, chess.BLACK: 0}
+    for color in chess.COLORS:
+        for square in chess.SquareSet(board.occupied_co[color]):
+            attacks[color] |= board.attacks_mask(square)
+    return attacks
+
+def get_board_background(square_size):
+    """
+    The empty board, drawn once and reused.
+    """
+    key = ("board", square_size)
+    if key not in surface_cache:
+        surface = pygame.Surface((square_size * 8, square_size * 8))
+        draw_board(surface, square_size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface_cache[key] = surface
+    return surface_cache[key]
+
+def get_highlight_tile(color, square_size):
+    """
+    A square-sized, semi-transparent tile of the given RGBA color, built once and reused.
+    """
+    key = ("tile", color, square_size)
+    if key not in surface_cache:
+        tile = pygame.Surface((square_size, square_size), pygame.SRCALPHA)
+        tile.fill(color)
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert_alpha()
+        surface_cache[key] = tile
+    return surface_cache[key]
+
+def compute_analysis(board):
+    """
+    Work out the attack maps, hanging pieces and check square for a position.
+    """
+    attacks = compute_attack_maps(board)
+    hanging = 0
+    for color in chess.COLORS:
+        # Kings can't hang (being attacked is check)
+        hanging |= board.occupied_co[color] & ~board.kings & attacks[not color] & ~attacks[color]
+    check = board.king(board.turn) if board.is_check() else None
+    return {"attacks": attacks, "hanging": hanging, "check": check}
+
+def draw_analysis(surface, board, analysis, square_size):
+    """
+    Draw the squares attacked by the opponent of the side to move, the hanging pieces
+    and the king in check onto a surface that already has the board squares on it.
+    """
+    attacked_tile = get_highlight_tile(ATTACKED_COLOR, square_size)
+    for square in chess.SquareSet(analysis["attacks"][not board.turn]):
+        surface.blit(attacked_tile, get_square_rect(square, square_size))
+    for square in chess.SquareSet(analysis["hanging"]):
+        pygame.draw.rect(surface, HANGING_COLOR, get_square_rect(square, square_size), 4)
+    if analysis["check"] is not None:
+        surface.blit(get_highlight_tile(CHECK_COLOR, square_size), get_square_rect(analysis["check"], square_size))
+
 def draw_board(screen, square_size):
     """
     Draw the 8x8 chess board.
@@ -145,14 +265,32 @@ def square_from_mouse_pos(pos, square_size):
     rank = 7 - row          # convert row back to chess rank
     return chess.square(col, rank)
 
-# --- Main Game Loop ---
+# --- Chess Scene ---
+
+class ChessScene(Scene):
+    size = (WIDTH, HEIGHT)
+    caption = "Socx Chess (WIP)"
+
+    def __init__(self):
+        super().__init__()
+        # Create a chess board (using python-chess) that keeps its own attack maps
+        self.board = AnalysisBoard()
+        # The analysis overlay (attacked squares, hanging pieces, check) can be toggled with "A".
+        self.show_analysis = True
+        # Instead of a selected square, we now keep track of a piece being dragged.
+        # dragging_info is a dictionary containing:
+        #   - "from_square": the square index where the piece was picked up.
+        #   - "piece": the chess.Piece object being dragged.
+        #   - "offset": the (x,y) offset from the top-left of the square where the mouse was clicked.
+        #   - "current_pos": the current mouse position (updated during dragging).
+        self.dragging_info = None
+
+    def handle_event(self, event):
+        board = self.board
 
-running = True
-while running:
-    for event in pygame.event.get():
-        # Quit if the window is closed.
-        if event.type == pygame.QUIT:
-            running = False
+        # --- Toggle Analysis Overlay ---
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_a:
+            self.show_analysis = not self.show_analysis
 
         # --- Start Dragging ---
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not board.is_game_over():
@@ -164,7 +302,7 @@ while running:
                 rect = get_square_rect(square, SQUARE_SIZE)
                 offset_x = pos[0] - rect.x
                 offset_y = pos[1] - rect.y
-                dragging_info = {
+                self.dragging_info = {
                     "from_square": square,
                     "piece": piece,
                     "offset": (offset_x, offset_y),
@@ -173,14 +311,14 @@ while running:
 
         # --- Update Dragging Position ---
         if event.type == pygame.MOUSEMOTION:
-            if dragging_info is not None:
-                dragging_info["current_pos"] = event.pos
+            if self.dragging_info is not None:
+                self.dragging_info["current_pos"] = event.pos
 
         # --- Drop the Piece ---
-        if event.type == pygame.MOUSEBUTTONUP and event.button == 1 and dragging_info is not None:
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.dragging_info is not None:
             pos = event.pos
             to_square = square_from_mouse_pos(pos, SQUARE_SIZE)
-            from_square = dragging_info["from_square"]
+            from_square = self.dragging_info["from_square"]
             move = chess.Move(from_square, to_square)
             # Handle ambiguous moves (like pawn promotion) by checking legal moves.
             if move not in board.legal_moves:
@@ -191,16 +329,25 @@ while running:
             if move in board.legal_moves:
                 board.push(move)
             # Clear the dragging info whether the move was legal or not.
-            dragging_info = None
-
-    # --- Drawing ---
-    SCREEN.fill((0, 0, 0))
-    draw_board(SCREEN, SQUARE_SIZE)
-    draw_move_hints(SCREEN, board, SQUARE_SIZE, dragging_info)
-    draw_pieces(SCREEN, board, SQUARE_SIZE, dragging_info)
-    draw_game_over(SCREEN, board, SQUARE_SIZE)
-    pygame.display.flip()
-    CLOCK.tick(60)
-
-pygame.quit()
-sys.exit()
+            self.dragging_info = None
+
+    def render(self, screen):
+        screen.fill((0, 0, 0))
+        if self.show_analysis:
+            # Board squares and analysis overlay, pre-built for this position
+            screen.blit(self.board.analysis_surface(SQUARE_SIZE), (0, 0))
+        else:
+            screen.blit(get_board_background(SQUARE_SIZE), (0, 0))
+        draw_move_hints(screen, self.board, SQUARE_SIZE, self.dragging_info)
+        draw_pieces(screen, self.board, SQUARE_SIZE, self.dragging_info)
+        draw_game_over(screen, self.board, SQUARE_SIZE)
+
+# --- Main ---
+
+def main():
+    GameLoop().run(ChessScene())
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()